@@ -3,7 +3,7 @@ ST7735S Display Vision Service for Robot Face
 Displays animated robot faces that can be controlled via Viam commands
 """
 
-from typing import ClassVar, Mapping, Sequence, Any, Dict, Optional, List
+from typing import ClassVar, Mapping, Sequence, Any, Dict, Optional, List, Tuple, Callable, Awaitable, Union
 from typing_extensions import Self
 from viam.module.types import Reconfigurable
 from viam.proto.app.robot import ComponentConfig
@@ -16,16 +16,238 @@ from viam.proto.service.vision import Classification, Detection
 from viam.proto.service.vision import GetPropertiesResponse, CaptureAllFromCameraResponse
 
 import asyncio
-from PIL import Image, ImageDraw
+import functools
+import logging
+import math
+import queue
+import threading
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
 
 LOGGER = getLogger(__name__)
 
+try:
+    # Hardware libraries (only available when actually running on a Pi)
+    import board
+    import digitalio
+    from adafruit_rgb_display import st7789
+    _HW_IMPORT_ERROR: Optional[Exception] = None
+except (ImportError, NotImplementedError) as e:
+    # Blinka raises NotImplementedError on boards it doesn't recognize
+    _HW_IMPORT_ERROR = e
+    LOGGER.warning(f"Display libraries not available (probably not on Pi): {e}")
+
+
+# Claiming a GPIO line or opening the SPI device again while the previous
+# handle is still alive fails or resets it on Blinka, so each is opened once
+# per process and shared by every display that reconfigure builds
+
+@functools.lru_cache(maxsize=None)
+def _digital_io(n: int):
+    """The DigitalInOut for GPIO number n"""
+    return digitalio.DigitalInOut(getattr(board, f"D{n}"))
+
+
+@functools.lru_cache(maxsize=None)
+def _spi_bus():
+    """The board's SPI bus"""
+    return board.SPI()
+
+
+def _int_attr(attrs, name: str, default: int) -> int:
+    """Integer config attribute, or default if it's missing or not a number"""
+    value = attrs.get(name)
+    if value is None:
+        return default
+    # Handle both direct values and protobuf Value objects. A Value holding
+    # a string or bool still reads as number_value 0, so check its kind
+    if hasattr(value, 'number_value'):
+        return int(value.number_value) if value.WhichOneof("kind") == "number_value" else default
+    elif isinstance(value, (int, float)):
+        return int(value)
+    else:
+        return default
+
+
+# Expressions accepted by set_face, and the keys of the face cache
+_VALID_EXPRESSIONS = frozenset({"happy", "sad", "surprised", "sleepy", "angry", "neutral", "confused", "thinking"})
+
+
+def _rgb565(color) -> int:
+    """Pack an (r, g, b) tuple into the display's native 16-bit RGB565 format"""
+    r, g, b = color
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+
+# Face palette, packed to RGB565 once at import
+_COLOR565 = {name: _rgb565(rgb) for name, rgb in {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "light_gray": (200, 200, 200),
+    "gray": (150, 150, 150),
+    "dark_gray": (100, 100, 100),
+    "red": (255, 0, 0),
+    "pink": (255, 100, 100),
+    "yellow": (255, 255, 0),
+    "olive": (200, 200, 0),
+    "cyan": (0, 255, 255),
+    "blue": (100, 100, 255),
+}.items()}
+
+
+def _pack_rgb565(pixels: Union[Image.Image, np.ndarray]) -> np.ndarray:
+    """Convert an RGB image, or any (..., 3) array of 8-bit RGB, to uint16 RGB565 values"""
+    rgb = np.asarray(pixels).astype(np.uint16)
+    return ((rgb[..., 0] & 0xF8) << 8) | ((rgb[..., 1] & 0xFC) << 3) | (rgb[..., 2] >> 3)
+
+
+def _unpack_rgb565(values: np.ndarray) -> np.ndarray:
+    """Expand RGB565 values back to (..., 3) 8-bit RGB, the inverse of _pack_rgb565"""
+    values = np.asarray(values, dtype=np.uint16)
+    r, g, b = (values >> 11) & 0x1F, (values >> 5) & 0x3F, values & 0x1F
+    return np.stack(((r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)), axis=-1)
+
+
+# Framebuffer drawing primitives. Each one works on an (H, W) uint16 RGB565
+# array, the display's native pixel format, and tests every pixel of the
+# shape's bounding box at once with NumPy boolean masks. Colors are packed
+# RGB565 values (see _COLOR565) and bounding boxes follow PIL's
+# (x0, y0, x1, y1) convention.
+
+def _window(buf, x0, y0, x1, y1):
+    """The part of buf inside a bounding box, with its row and column coordinate grids"""
+    height, width = buf.shape
+    top, left = max(math.floor(y0), 0), max(math.floor(x0), 0)
+    bottom = max(min(math.ceil(y1) + 1, height), top)
+    right = max(min(math.ceil(x1) + 1, width), left)
+    yy, xx = np.ogrid[top:bottom, left:right]
+    return buf[top:bottom, left:right], yy, xx
+
+
+def _inside_ellipse(yy, xx, cx, cy, rx, ry):
+    return ((xx - cx) / rx) ** 2 + ((yy - cy) / ry) ** 2 <= 1.0
+
+
+def _ellipse_masked(buf, x0, y0, x1, y1, color):
+    view, yy, xx = _window(buf, x0, y0, x1, y1)
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    rx, ry = (x1 - x0) / 2 + 0.5, (y1 - y0) / 2 + 0.5
+    view[_inside_ellipse(yy, xx, cx, cy, rx, ry)] = color
+
+
+def _arc_masked(buf, x0, y0, x1, y1, start, end, line_width, color):
+    view, yy, xx = _window(buf, x0, y0, x1, y1)
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    rx, ry = (x1 - x0) / 2 + 0.5, (y1 - y0) / 2 + 0.5
+    mask = _inside_ellipse(yy, xx, cx, cy, rx, ry)
+    if rx > line_width and ry > line_width:
+        mask &= ~_inside_ellipse(yy, xx, cx, cy, rx - line_width, ry - line_width)
+    span = end - start
+    if span < 360.0:
+        theta = np.degrees(np.arctan2(yy - cy, xx - cx))
+        mask &= (theta - start) % 360.0 <= span
+    view[mask] = color
+
+
+def _polyline_masked(buf, points, line_width, color):
+    half = line_width / 2
+    view, yy, xx = _window(buf, points[:, 0].min() - half, points[:, 1].min() - half,
+                           points[:, 0].max() + half, points[:, 1].max() + half)
+    mask = np.zeros(view.shape, dtype=bool)
+    for (x0, y0), (x1, y1) in zip(points[:-1], points[1:]):
+        dx, dy = x1 - x0, y1 - y0
+        length = max(math.hypot(dx, dy), 1e-9)
+        along = ((xx - x0) * dx + (yy - y0) * dy) / length
+        across = np.abs((xx - x0) * dy - (yy - y0) * dx) / length
+        mask |= (along >= -0.5) & (along <= length + 0.5) & (across <= half)
+    view[mask] = color
+
+
+def _circle_bbox(x: int, y: int, radius: int):
+    """Bounding box of a circle, in the (x0, y0, x1, y1) form the primitives take"""
+    return (x - radius, y - radius, x + radius, y + radius)
+
+
+def _fill_ellipse(buf: np.ndarray, bbox, color: int):
+    """Fill the ellipse inscribed in bbox, like ImageDraw.ellipse"""
+    x0, y0, x1, y1 = bbox
+    _ellipse_masked(buf, float(x0), float(y0), float(x1), float(y1), color)
+
+
+def _draw_arc(buf: np.ndarray, bbox, start: float, end: float, color: int, width: int):
+    """Draw an arc of the ellipse in bbox, like ImageDraw.arc (degrees, clockwise from 3 o'clock)"""
+    x0, y0, x1, y1 = bbox
+    _arc_masked(buf, float(x0), float(y0), float(x1), float(y1),
+                float(start), float(end), float(width), color)
+
+
+def _draw_line(buf: np.ndarray, xy, color: int, width: int):
+    """Draw a line or polyline with flat ends, like ImageDraw.line
+
+    xy is either a flat (x0, y0, x1, y1, ...) sequence or a list of (x, y)
+    points; all segments are rasterized in a single call.
+    """
+    points = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+    _polyline_masked(buf, points, float(width), color)
+
+
+def _paste_sprite(buf: np.ndarray, sprite: np.ndarray, x: int, y: int):
+    """Copy the non-black pixels of sprite into buf with its top-left corner at (x, y)"""
+    height, width = sprite.shape
+    top, left = max(y, 0), max(x, 0)
+    bottom, right = min(y + height, buf.shape[0]), min(x + width, buf.shape[1])
+    if top >= bottom or left >= right:
+        return
+    part = sprite[top - y:bottom - y, left - x:right - x]
+    np.copyto(buf[top:bottom, left:right], part, where=part != 0)
+
+
+# PIL's default font, loaded once instead of by every new ImageDraw
+_FONT = ImageFont.load_default()
+
+
+def _draw_text(buf: np.ndarray, xy, text: str, color: int):
+    """Draw text with PIL's default font, which has no NumPy equivalent"""
+    mask = Image.new("L", (buf.shape[1], buf.shape[0]))
+    ImageDraw.Draw(mask).text(xy, text, fill=255, font=_FONT)
+    coverage = np.asarray(mask)
+    ys, xs = np.nonzero(coverage)
+    # The font is anti-aliased, so edge pixels are blended with what is
+    # already there by how much of them the glyph covers, as PIL does
+    alpha = coverage[ys, xs, np.newaxis] / 255
+    blended = _unpack_rgb565(buf[ys, xs]) * (1 - alpha) + _unpack_rgb565(np.uint16(color)) * alpha
+    buf[ys, xs] = _pack_rgb565(np.rint(blended).astype(np.uint8))
+
+
+def _runs(indices: np.ndarray, gap: int) -> List[Tuple[int, int]]:
+    """Group sorted indices into (first, last) runs, splitting where they jump by more than gap"""
+    if indices.size == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(indices) > gap)
+    starts = np.concatenate((indices[:1], indices[breaks + 1]))
+    ends = np.concatenate((indices[breaks], indices[-1:]))
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def _dirty_regions(changed: np.ndarray, gap: int = 4) -> List[Tuple[int, int, int, int]]:
+    """Bounding boxes around separate clusters of changed pixels, e.g. the eyes and the mouth"""
+    # Each extra region costs a CASET/RASET/RAMWR round, so clusters closer
+    # than a few pixels are merged rather than sent separately
+    regions = []
+    for y0, y1 in _runs(np.flatnonzero(changed.any(axis=1)), gap):
+        band = changed[y0:y1 + 1]
+        for x0, x1 in _runs(np.flatnonzero(band.any(axis=0)), gap):
+            rows = np.flatnonzero(band[:, x0:x1 + 1].any(axis=1))
+            regions.append((x0, y0 + int(rows[0]), x1, y0 + int(rows[-1])))
+    return regions
+
+
 class RobotFaceDisplay(Vision, Reconfigurable):
     """
     Vision Service for controlling ST7735S display to show robot faces
     
     Supported do_command operations:
-    - set_face: {"command": "set_face", "expression": "happy|sad|surprised|sleepy|neutral|angry|confused|thinking"}
+    - set_face: {"command": "set_face", "expression": "happy|sad|surprised|sleepy|neutral|angry|confused|thinking", "force": false}
     - get_face: {"command": "get_face"}
     - clear: {"command": "clear"}
     - custom_text: {"command": "custom_text", "text": "Hello!", "x": 10, "y": 50}
@@ -33,11 +255,28 @@ class RobotFaceDisplay(Vision, Reconfigurable):
     
     MODEL: ClassVar[Model] = Model(ModelFamily("wootter", "vision"), "st7789")
     
+    # (expression, width, height, rotation) -> frame ready for _push_frame
+    _FACE_CACHE: ClassVar[Dict[Tuple[str, int, int, int], np.ndarray]] = {}
+    # (width, height) -> draw operations for each face, see _build_face_ops
+    _FACE_OPS: ClassVar[Dict[Tuple[int, int], Dict[str, List[tuple]]]] = {}
+    
     display = None
+    _display_config: Optional[tuple] = None
+    _spi_thread: Optional[threading.Thread] = None
     current_face: str = "neutral"
     width: int = 240
     height: int = 240
     
+    def __init__(self, name: str, **kwargs):
+        super().__init__(name, **kwargs)
+        # Taken by the commands that change the screen, so concurrent calls
+        # can't interleave their frames
+        self._display_lock = asyncio.Lock()
+        # Held by reconfigure and close while they replace the canvas, SPI
+        # queue and display, and by _show_text, which uses them from the
+        # thread pool
+        self._config_lock = threading.Lock()
+    
     @classmethod
     def new(cls, config: ComponentConfig, dependencies: Mapping[ResourceName, ResourceBase]) -> Self:
         """Create new instance of RobotFaceDisplay"""
@@ -52,180 +291,363 @@ class RobotFaceDisplay(Vision, Reconfigurable):
     
     def reconfigure(self, config: ComponentConfig, dependencies: Mapping[ResourceName, ResourceBase]):
         """Configure the display hardware"""
+        with self._config_lock:
+            self._configure(config)
+    
+    def _configure(self, config: ComponentConfig):
+        """Apply config to the display, with _config_lock held"""
+        # Let any frames still queued for the old display go out first
+        self._stop_spi_worker()
         attrs = config.attributes.fields
         
-        # Helper function to get value from protobuf Value object
-        def get_int_attr(name: str, default: int) -> int:
-            if name not in attrs:
-                return default
-            value = attrs[name]
-            # Handle both direct values and protobuf Value objects
-            if hasattr(value, 'number_value'):
-                return int(value.number_value)
-            elif isinstance(value, (int, float)):
-                return int(value)
-            else:
-                return default
-        
         # Get pin configuration (with defaults)
-        cs_pin_num = get_int_attr("cs_pin", 8)
-        dc_pin_num = get_int_attr("dc_pin", 25)
-        reset_pin_num = get_int_attr("reset_pin", 24)
-        backlight_pin_num = get_int_attr("backlight_pin", 18) # <-- ADDED
-        rotation = get_int_attr("rotation", 90)
+        cs_pin_num = _int_attr(attrs, "cs_pin", 8)
+        dc_pin_num = _int_attr(attrs, "dc_pin", 25)
+        reset_pin_num = _int_attr(attrs, "reset_pin", 24)
+        backlight_pin_num = _int_attr(attrs, "backlight_pin", 18) # <-- ADDED
+        rotation = _int_attr(attrs, "rotation", 90)
+        # The ST7789 is typically fine well above the 24 MHz we used to run
+        # at, and full-frame pushes are bound by SPI bandwidth
+        baudrate = _int_attr(attrs, "baudrate", 40000000)
         
         # Optional: custom width/height
-        self.width = get_int_attr("width", 240)
-        self.height = get_int_attr("height", 240)
+        self.width = _int_attr(attrs, "width", 240)
+        self.height = _int_attr(attrs, "height", 240)
+        
+        self._rotation = rotation
+        self._text_canvas = Image.new("RGB", (self.width, self.height), (0, 0, 0))
+        self._text_draw = ImageDraw.Draw(self._text_canvas)
+        # What is currently on the panel (rotated), None when unknown
+        self._last_frame: Optional[np.ndarray] = None
+        # Face currently on the panel, None after clear/custom_text
+        self._shown_face: Optional[str] = None
+        self._setup_geometry()
+        
+        # Faces only depend on the expression, display size and rotation, so
+        # each one is rendered once per process in the exact form that goes
+        # over SPI and shared by every reconfigure with the same shape
+        self._face_cache: Dict[str, np.ndarray] = {}
+        for expression in _VALID_EXPRESSIONS:
+            key = (expression, self.width, self.height, rotation)
+            frame = self._FACE_CACHE.get(key)
+            if frame is None:
+                frame = self._to_panel(self._render_face(expression))
+                frame.flags.writeable = False
+                self._FACE_CACHE[key] = frame
+            self._face_cache[expression] = frame
+        self._black_frame = self._to_panel(np.zeros((self.height, self.width), dtype=np.uint16))
+        
+        # Without the hardware libraries (already logged at import) faces are
+        # still rendered, there's just nothing to push them to
+        if _HW_IMPORT_ERROR is not None:
+            self.display = None
+            return
+        
+        # Re-initializing the ST7789 resets the panel and sits through its
+        # init delays, so keep the current one if the wiring hasn't changed
+        display_config = (cs_pin_num, dc_pin_num, reset_pin_num, backlight_pin_num,
+                          rotation, baudrate, self.width, self.height)
         
         try:
-            # Import hardware libraries (only when actually running on Pi)
-            import board
-            import digitalio
-            from adafruit_rgb_display import st7789
-            
-            # Setup GPIO pins
-            cs_pin = digitalio.DigitalInOut(getattr(board, f"D{cs_pin_num}"))
-            dc_pin = digitalio.DigitalInOut(getattr(board, f"D{dc_pin_num}"))
-            reset_pin = digitalio.DigitalInOut(getattr(board, f"D{reset_pin_num}"))
-            backlight_pin = digitalio.DigitalInOut(getattr(board, f"D{backlight_pin_num}")) # <-- ADDED
+            if self.display is None or display_config != self._display_config:
+                self.display = None
+                
+                # Setup GPIO pins
+                cs_pin = _digital_io(cs_pin_num)
+                dc_pin = _digital_io(dc_pin_num)
+                reset_pin = _digital_io(reset_pin_num)
+                backlight_pin = _digital_io(backlight_pin_num) # <-- ADDED
+                
+                # Initialize display
+                self.display = st7789.ST7789(
+                    _spi_bus(),
+                    cs=cs_pin,
+                    dc=dc_pin,
+                    rst=reset_pin,
+                    baudrate=baudrate,
+                    rotation=rotation,
+                    width=self.width,
+                    height=self.height,
+                    backlight_pin=backlight_pin # <-- ADDED
+                )
+                backlight_pin.switch_to_output(value=True) # <-- ADDED: Turn on backlight
+                self._display_config = display_config
+
+                LOGGER.info(f"ST7789 display initialized (pins: CS={cs_pin_num}, DC={dc_pin_num}, RST={reset_pin_num}, BL={backlight_pin_num}, SPI={baudrate}Hz)")
             
-            # Initialize display
-            self.display = st7789.ST7789(
-                board.SPI(),
-                cs=cs_pin,
-                dc=dc_pin,
-                rst=reset_pin,
-                baudrate=24000000, # <-- ADDED: Faster SPI
-                rotation=rotation,
-                width=self.width,
-                height=self.height,
-                backlight_pin=backlight_pin # <-- ADDED
-            )
-            backlight_pin.switch_to_output(value=True) # <-- ADDED: Turn on backlight
-
-            LOGGER.info(f"ST7789 display initialized (pins: CS={cs_pin_num}, DC={dc_pin_num}, RST={reset_pin_num}, BL={backlight_pin_num})")
+            self._start_spi_worker()
             
             # Show initial neutral face
             self._draw_face("neutral")
             
-        except ImportError as e:
-            LOGGER.warning(f"Display libraries not available (probably not on Pi): {e}")
-            self.display = None
         except Exception as e:
             raise Exception(f"Failed to initialize ST7735S display: {e}")
     
-    def _draw_face(self, expression: str):
-        """Draw a robot face with the given expression"""
+    def _draw_face(self, expression: str, force: bool = False):
+        """Draw a robot face with the given expression (force repaints the whole screen)"""
         if self.display is None:
             LOGGER.warning("Display not initialized, skipping draw")
             return
         
-        # Create black background
-        image = Image.new("RGB", (self.width, self.height), (0, 0, 0))
-        draw = ImageDraw.Draw(image)
+        if not force and expression == self._shown_face:
+            return
         
+        # Forced draws don't trust what we think is on the panel and send a
+        # full frame instead of the changed regions
+        self._queue_frame(self._face_cache[expression], full=force)
+        self.current_face = self._shown_face = expression
+        # set_face can be called at a high rate, so skip formatting the
+        # message unless it will actually be logged
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("Drew face: %s", expression)
+    
+    def _show_text(self, text: str, x: int, y: int):
+        """Show white text on a black screen"""
+        # Runs in the thread pool, so a reconfigure or close could otherwise
+        # swap the canvas and SPI queue out from under it
+        with self._config_lock:
+            if self.display is None:
+                return
+            self._text_draw.rectangle((0, 0, self.width, self.height), fill=(0, 0, 0))
+            self._text_draw.text((x, y), text, fill=(255, 255, 255), font=_FONT)
+            self._queue_frame(self._to_panel(_pack_rgb565(self._text_canvas)))
+            self._shown_face = None
+    
+    def _queue_frame(self, frame: np.ndarray, full: bool = False):
+        """Hand a frame to the SPI thread without waiting for it to be sent"""
+        # Latest wins: during a burst of updates only the newest frame
+        # matters, so one the SPI thread hasn't picked up yet is replaced
+        # rather than waited for
+        with self._spi_q_lock:
+            try:
+                _, stale_full = self._spi_q.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                self._spi_q.task_done()
+                full = full or stale_full
+            self._spi_q.put_nowait((frame, full))
+    
+    def _start_spi_worker(self):
+        """Start the thread that pushes queued frames to the display"""
+        self._spi_q: queue.Queue = queue.Queue(maxsize=1)
+        self._spi_q_lock = threading.Lock()
+        self._spi_thread = threading.Thread(target=self._spi_worker, name="st7789-spi", daemon=True)
+        self._spi_thread.start()
+    
+    def _stop_spi_worker(self):
+        """Flush queued frames and stop the SPI thread, if it is running"""
+        if self._spi_thread is None:
+            return
+        with self._spi_q_lock:
+            self._spi_q.put(None)
+        self._spi_thread.join()
+        self._spi_thread = None
+    
+    def _spi_worker(self):
+        """Push frames from the queue to the display until told to stop"""
+        while True:
+            item = self._spi_q.get()
+            try:
+                if item is None:
+                    return
+                frame, full = item
+                if full:
+                    self._last_frame = None
+                self._push_frame(frame)
+            except Exception as e:
+                LOGGER.error(f"Error pushing frame to display: {e}")
+            finally:
+                self._spi_q.task_done()
+    
+    def _to_panel(self, frame: np.ndarray) -> np.ndarray:
+        """Rotate an RGB565 framebuffer to the panel's orientation and byte order"""
+        # Same rotation display.image() applies, but done once per frame we
+        # keep instead of on every push
+        return np.ascontiguousarray(np.rot90(frame, self._rotation // 90), dtype=">u2")
+    
+    def _push_frame(self, frame: np.ndarray):
+        """Send a framebuffer prepared by _to_panel straight to the display"""
+        height, width = frame.shape
+        regions = [(0, 0, width - 1, height - 1)]
+        
+        # Faces mostly differ around the eyes and mouth, so only send the
+        # rectangles that changed since the last frame we pushed
+        if self._last_frame is not None and self._last_frame.shape == frame.shape:
+            regions = _dirty_regions(frame != self._last_frame)
+        
+        # One RAMWR per region, each as a single SPI write
+        for x0, y0, x1, y1 in regions:
+            self.display._block(x0, y0, x1, y1, frame[y0:y1 + 1, x0:x1 + 1].tobytes())
+        self._last_frame = frame
+    
+    def _setup_geometry(self):
+        """Look up the draw operations for every face at the configured size"""
+        # Face geometry only depends on the display size, so the table is
+        # built once per size and shared by every reconfigure that uses it
+        size = (self.width, self.height)
+        if size not in self._FACE_OPS:
+            self._FACE_OPS[size] = self._build_face_ops()
+        self._face_ops = self._FACE_OPS[size]
+    
+    def _build_face_ops(self) -> Dict[str, List[tuple]]:
+        """Precompute the draw operations for every face at the configured size"""
         # Face positioning (scaled for 240x240)
-        center_x = self.width // 2
-        eye_y = self.height // 3
-        eye_spacing = self.width // 4  # Approx 60px
-        eye_radius = self.width // 12 # Approx 20px
-        mouth_y = int(self.height * 0.7)
-        mouth_width = self.width // 3 # Approx 80px
+        cx = self.width // 2
+        ey = self.height // 3
+        es = self.width // 4  # Approx 60px
+        er = self.width // 12 # Approx 20px
+        my = int(self.height * 0.7)
+        mw = self.width // 3 # Approx 80px
         line_width = 6
-
-        # Draw based on expression
-        if expression == "happy":
-            # Happy eyes (circles)
-            draw.ellipse((center_x - eye_spacing - eye_radius, eye_y - eye_radius, center_x - eye_spacing + eye_radius, eye_y + eye_radius), fill=(0, 255, 255))
-            draw.ellipse((center_x + eye_spacing - eye_radius, eye_y - eye_radius, center_x + eye_spacing + eye_radius, eye_y + eye_radius), fill=(0, 255, 255))
-            # Big smile
-            draw.arc((center_x - mouth_width//2, mouth_y - 20, center_x + mouth_width//2, mouth_y + 20), 
-                    start=0, end=180, fill=(255, 255, 0), width=line_width)
-
-        elif expression == "sad":
-            # Sad eyes (half-closed)
-            draw.arc((center_x - eye_spacing - eye_radius, eye_y, center_x - eye_spacing + eye_radius, eye_y + eye_radius*1.5), 
-                    start=180, end=360, fill=(100, 100, 255), width=line_width)
-            draw.arc((center_x + eye_spacing - eye_radius, eye_y, center_x + eye_spacing + eye_radius, eye_y + eye_radius*1.5), 
-                    start=180, end=360, fill=(100, 100, 255), width=line_width)
-            # Frown
-            draw.arc((center_x - mouth_width//2, mouth_y, center_x + mouth_width//2, mouth_y + 40), 
-                    start=180, end=360, fill=(255, 100, 100), width=line_width)
-
-        elif expression == "surprised":
-            # Wide open eyes
-            draw.ellipse((center_x - eye_spacing - eye_radius, eye_y - eye_radius, center_x - eye_spacing + eye_radius, eye_y + eye_radius), fill=(255, 255, 255))
-            draw.ellipse((center_x + eye_spacing - eye_radius, eye_y - eye_radius, center_x + eye_spacing + eye_radius, eye_y + eye_radius), fill=(255, 255, 255))
-            # Small pupils
-            pupil_radius = eye_radius // 3
-            draw.ellipse((center_x - eye_spacing - pupil_radius, eye_y - pupil_radius, center_x - eye_spacing + pupil_radius, eye_y + pupil_radius), fill=(0, 0, 0))
-            draw.ellipse((center_x + eye_spacing - pupil_radius, eye_y - pupil_radius, center_x + eye_spacing + pupil_radius, eye_y + pupil_radius), fill=(0, 0, 0))
-            # Open mouth (O shape)
-            draw.ellipse((center_x - 20, mouth_y, center_x + 20, mouth_y + 35), fill=(255, 255, 255))
-
-        elif expression == "sleepy":
-            # Closed eyes (horizontal lines)
-            draw.line((center_x - eye_spacing - eye_radius, eye_y, center_x - eye_spacing + eye_radius, eye_y), fill=(200, 200, 200), width=line_width)
-            draw.line((center_x + eye_spacing - eye_radius, eye_y, center_x + eye_spacing + eye_radius, eye_y), fill=(200, 200, 200), width=line_width)
-            # Zzz
-            draw.text((center_x + 60, eye_y - 50), "Z", fill=(150, 150, 150))
-            draw.text((center_x + 75, eye_y - 70), "Z", fill=(100, 100, 100))
-            # Small smile
-            draw.arc((center_x - 30, mouth_y, center_x + 30, mouth_y + 20), start=0, end=180, fill=(200, 200, 200), width=line_width-2)
-
-        elif expression == "angry":
-            # Angry eyes (angled lines)
-            draw.line((center_x - eye_spacing - eye_radius, eye_y - 10, center_x - eye_spacing + eye_radius, eye_y + 10), fill=(255, 0, 0), width=line_width)
-            draw.line((center_x + eye_spacing - eye_radius, eye_y + 10, center_x + eye_spacing + eye_radius, eye_y - 10), fill=(255, 0, 0), width=line_width)
-            # Angry mouth
-            draw.line((center_x - mouth_width//2, mouth_y + 15, center_x + mouth_width//2, mouth_y), fill=(255, 0, 0), width=line_width)
-
-        elif expression == "confused":
-            # Eyes at different heights
-            draw.ellipse((center_x - eye_spacing - eye_radius, eye_y - eye_radius, center_x - eye_spacing + eye_radius, eye_y + eye_radius), fill=(255, 255, 255))
-            draw.ellipse((center_x + eye_spacing - eye_radius, eye_y - eye_radius + 10, center_x + eye_spacing + eye_radius, eye_y + eye_radius + 10), fill=(255, 255, 255))
-            # Pupils
-            pupil_radius = eye_radius // 3
-            draw.ellipse((center_x - eye_spacing - pupil_radius, eye_y - pupil_radius, center_x - eye_spacing + pupil_radius, eye_y + pupil_radius), fill=(0, 0, 0))
-            draw.ellipse((center_x + eye_spacing - pupil_radius, eye_y - pupil_radius + 10, center_x + eye_spacing + pupil_radius, eye_y + pupil_radius + 10), fill=(0, 0, 0))
-            # Squiggly mouth
-            mouth_x = center_x - mouth_width//2
-            draw.line((mouth_x, mouth_y + 5, mouth_x + 20, mouth_y - 5), fill=(200, 200, 0), width=line_width)
-            draw.line((mouth_x + 20, mouth_y - 5, mouth_x + 40, mouth_y + 5), fill=(200, 200, 0), width=line_width)
-            draw.line((mouth_x + 40, mouth_y + 5, mouth_x + 60, mouth_y - 5), fill=(200, 200, 0), width=line_width)
-
-        elif expression == "thinking":
-            # Spiral eyes
-            for i in range(int(eye_radius / 2)):
-                angle1 = i * 72
-                angle2 = (i + 1) * 72
-                r = i * 2
-                # Left eye
-                draw.arc((center_x - eye_spacing - r, eye_y - r, center_x - eye_spacing + r, eye_y + r),
-                         start=angle1, end=angle2, fill=(100, 100, 255), width=3)
-                # Right eye
-                draw.arc((center_x + eye_spacing - r, eye_y - r, center_x + eye_spacing + r, eye_y + r),
-                         start=angle1, end=angle2, fill=(100, 100, 255), width=3)
-            # Thinking mouth
-            draw.line((center_x - 25, mouth_y, center_x + 25, mouth_y), fill=(200, 200, 200), width=line_width)
-            draw.line((center_x + 25, mouth_y, center_x + 35, mouth_y - 10), fill=(200, 200, 200), width=line_width)
-
-        else:  # neutral
-            # Neutral eyes (circles)
-            draw.ellipse((center_x - eye_spacing - eye_radius, eye_y - eye_radius, center_x - eye_spacing + eye_radius, eye_y + eye_radius), fill=(255, 255, 255))
-            draw.ellipse((center_x + eye_spacing - eye_radius, eye_y - eye_radius, center_x + eye_spacing + eye_radius, eye_y + eye_radius), fill=(255, 255, 255))
-            # Pupils
-            pupil_radius = eye_radius // 2
-            draw.ellipse((center_x - eye_spacing - pupil_radius, eye_y - pupil_radius, center_x - eye_spacing + pupil_radius, eye_y + pupil_radius), fill=(0, 0, 0))
-            draw.ellipse((center_x + eye_spacing - pupil_radius, eye_y - pupil_radius, center_x + eye_spacing + pupil_radius, eye_y + pupil_radius), fill=(0, 0, 0))
-            # Straight mouth
-            draw.line((center_x - mouth_width//2, mouth_y, center_x + mouth_width//2, mouth_y), fill=(200, 200, 200), width=line_width)
         
-        # Display the image
-        self.display.image(image)
-        self.current_face = expression
-        LOGGER.debug(f"Drew face: {expression}")
+        # Eye centers and the boxes shared by several expressions
+        lx, rx = cx - es, cx + es
+        left_eye, right_eye = _circle_bbox(lx, ey, er), _circle_bbox(rx, ey, er)
+        left_pupil, right_pupil = _circle_bbox(lx, ey, er // 2), _circle_bbox(rx, ey, er // 2)
+        left_small_pupil, right_small_pupil = _circle_bbox(lx, ey, er // 3), _circle_bbox(rx, ey, er // 3)
+        
+        # Multi-stroke shapes are drawn once into small sprites here and
+        # pasted into the face, instead of replaying every stroke
+        spiral = np.zeros((2*er + 1, 2*er + 1), dtype=np.uint16)
+        for i in range(int(er / 2)):
+            _draw_arc(spiral, _circle_bbox(er, er, i * 2), i * 72, (i + 1) * 72, _COLOR565["blue"], 3)
+        pad = line_width
+        squiggle = np.zeros((10 + 2*pad + 1, 60 + 2*pad + 1), dtype=np.uint16)
+        _draw_line(squiggle, [(x + pad, y + pad) for x, y in ((0, 10), (20, 0), (40, 10), (60, 0))],
+                   _COLOR565["olive"], line_width)
+        
+        # expression -> [(primitive, *args after buf), ...], replayed in order
+        return {
+            "happy": [
+                # Happy eyes (circles)
+                (_fill_ellipse, left_eye, _COLOR565["cyan"]),
+                (_fill_ellipse, right_eye, _COLOR565["cyan"]),
+                # Big smile
+                (_draw_arc, (cx - mw//2, my - 20, cx + mw//2, my + 20), 0, 180, _COLOR565["yellow"], line_width),
+            ],
+            "sad": [
+                # Sad eyes (half-closed)
+                (_draw_arc, (lx - er, ey, lx + er, ey + er*1.5), 180, 360, _COLOR565["blue"], line_width),
+                (_draw_arc, (rx - er, ey, rx + er, ey + er*1.5), 180, 360, _COLOR565["blue"], line_width),
+                # Frown
+                (_draw_arc, (cx - mw//2, my, cx + mw//2, my + 40), 180, 360, _COLOR565["pink"], line_width),
+            ],
+            "surprised": [
+                # Wide open eyes
+                (_fill_ellipse, left_eye, _COLOR565["white"]),
+                (_fill_ellipse, right_eye, _COLOR565["white"]),
+                # Small pupils
+                (_fill_ellipse, left_small_pupil, _COLOR565["black"]),
+                (_fill_ellipse, right_small_pupil, _COLOR565["black"]),
+                # Open mouth (O shape)
+                (_fill_ellipse, (cx - 20, my, cx + 20, my + 35), _COLOR565["white"]),
+            ],
+            "sleepy": [
+                # Closed eyes (horizontal lines)
+                (_draw_line, (lx - er, ey, lx + er, ey), _COLOR565["light_gray"], line_width),
+                (_draw_line, (rx - er, ey, rx + er, ey), _COLOR565["light_gray"], line_width),
+                # Zzz
+                (_draw_text, (cx + 60, ey - 50), "Z", _COLOR565["gray"]),
+                (_draw_text, (cx + 75, ey - 70), "Z", _COLOR565["dark_gray"]),
+                # Small smile
+                (_draw_arc, (cx - 30, my, cx + 30, my + 20), 0, 180, _COLOR565["light_gray"], line_width-2),
+            ],
+            "angry": [
+                # Angry eyes (angled lines)
+                (_draw_line, (lx - er, ey - 10, lx + er, ey + 10), _COLOR565["red"], line_width),
+                (_draw_line, (rx - er, ey + 10, rx + er, ey - 10), _COLOR565["red"], line_width),
+                # Angry mouth
+                (_draw_line, (cx - mw//2, my + 15, cx + mw//2, my), _COLOR565["red"], line_width),
+            ],
+            "confused": [
+                # Eyes at different heights
+                (_fill_ellipse, left_eye, _COLOR565["white"]),
+                (_fill_ellipse, _circle_bbox(rx, ey + 10, er), _COLOR565["white"]),
+                # Pupils
+                (_fill_ellipse, left_small_pupil, _COLOR565["black"]),
+                (_fill_ellipse, _circle_bbox(rx, ey + 10, er // 3), _COLOR565["black"]),
+                # Squiggly mouth
+                (_paste_sprite, squiggle, cx - mw//2 - pad, my - 5 - pad),
+            ],
+            "thinking": [
+                # Spiral eyes
+                (_paste_sprite, spiral, lx - er, ey - er),
+                (_paste_sprite, spiral, rx - er, ey - er),
+                # Thinking mouth
+                (_draw_line, [(cx - 25, my), (cx + 25, my), (cx + 35, my - 10)], _COLOR565["light_gray"], line_width),
+            ],
+            "neutral": [
+                # Neutral eyes (circles)
+                (_fill_ellipse, left_eye, _COLOR565["white"]),
+                (_fill_ellipse, right_eye, _COLOR565["white"]),
+                # Pupils
+                (_fill_ellipse, left_pupil, _COLOR565["black"]),
+                (_fill_ellipse, right_pupil, _COLOR565["black"]),
+                # Straight mouth
+                (_draw_line, (cx - mw//2, my, cx + mw//2, my), _COLOR565["light_gray"], line_width),
+            ],
+        }
+    
+    def _render_face(self, expression: str) -> np.ndarray:
+        """Render the face for the given expression into a new RGB565 framebuffer"""
+        # Create black background
+        buf = np.zeros((self.height, self.width), dtype=np.uint16)
+        for primitive, *args in self._face_ops[expression]:
+            primitive(buf, *args)
+        return buf
+    
+    # Command handlers. Frames are queued for the SPI thread without
+    # blocking, so only custom_text, which still has to render, goes through
+    # the thread pool. Handlers that change the screen take _display_lock so
+    # concurrent calls can't interleave their frames or share the text canvas.
+    
+    async def _cmd_set_face(self, command: Mapping[str, Any]) -> Mapping[str, Any]:
+        """Change the robot's expression"""
+        expression = command.get("expression", "neutral")
+        
+        # Struct values can be lists or dicts, which can't be looked up
+        if not isinstance(expression, str) or expression not in _VALID_EXPRESSIONS:
+            return {
+                "success": False, 
+                "error": f"Invalid expression. Must be one of: {sorted(_VALID_EXPRESSIONS)}"
+            }
+        
+        async with self._display_lock:
+            self._draw_face(expression, force=bool(command.get("force", False)))
+        return {"success": True, "expression": expression}
+    
+    async def _cmd_get_face(self, command: Mapping[str, Any]) -> Mapping[str, Any]:
+        """Get current expression"""
+        return {"current_face": self.current_face}
+    
+    async def _cmd_clear(self, command: Mapping[str, Any]) -> Mapping[str, Any]:
+        """Clear the display"""
+        if self.display:
+            async with self._display_lock:
+                self._queue_frame(self._black_frame)
+                self._shown_face = None
+        return {"success": True}
+    
+    async def _cmd_custom_text(self, command: Mapping[str, Any]) -> Mapping[str, Any]:
+        """Draw custom text (future feature)"""
+        text = command.get("text", "")
+        x = int(command.get("x", 10))
+        y = int(command.get("y", 50))
+        
+        if self.display:
+            async with self._display_lock:
+                await asyncio.to_thread(self._show_text, text, x, y)
+        
+        return {"success": True, "text": text}
+    
+    # do_command name -> handler
+    _COMMANDS: ClassVar[Dict[str, Callable[..., Awaitable[Mapping[str, Any]]]]] = {
+        "set_face": _cmd_set_face,
+        "get_face": _cmd_get_face,
+        "clear": _cmd_clear,
+        "custom_text": _cmd_custom_text,
+    }
     
     async def do_command(self, command: Mapping[str, Any], *, timeout: Optional[float] = None, **kwargs) -> Mapping[str, Any]:
         """
@@ -237,49 +659,12 @@ class RobotFaceDisplay(Vision, Reconfigurable):
         - clear: Clear the display
         - custom_text: Draw custom text (future feature)
         """
-        
-        def _execute_command():
-            cmd = command.get("command")
-            
-            if cmd == "set_face":
-                expression = command.get("expression", "neutral")
-                valid_expressions = ["happy", "sad", "surprised", "sleepy", "angry", "neutral", "confused", "thinking"]
-                
-                if expression not in valid_expressions:
-                    return {
-                        "success": False, 
-                        "error": f"Invalid expression. Must be one of: {valid_expressions}"
-                    }
-                
-                self._draw_face(expression)
-                return {"success": True, "expression": expression}
-            
-            elif cmd == "get_face":
-                return {"current_face": self.current_face}
-            
-            elif cmd == "clear":
-                if self.display:
-                    image = Image.new("RGB", (self.width, self.height), (0, 0, 0))
-                    self.display.image(image)
-                return {"success": True}
-            
-            elif cmd == "custom_text":
-                text = command.get("text", "")
-                x = int(command.get("x", 10))
-                y = int(command.get("y", 50))
-                
-                if self.display:
-                    image = Image.new("RGB", (self.width, self.height), (0, 0, 0))
-                    draw = ImageDraw.Draw(image)
-                    draw.text((x, y), text, fill=(255, 255, 255))
-                    self.display.image(image)
-                
-                return {"success": True, "text": text}
-            
-            else:
-                return {"success": False, "error": f"Unknown command: {cmd}"}
-        
-        return await asyncio.to_thread(_execute_command)
+        cmd = command.get("command")
+        # Struct values can be lists or dicts, which can't be looked up
+        handler = self._COMMANDS.get(cmd) if isinstance(cmd, str) else None
+        if handler is None:
+            return {"success": False, "error": f"Unknown command: {cmd}"}
+        return await handler(self, command)
     
     # Vision service required methods (not used for display, but required by API)
     async def get_detections(self, image: bytes, *, extra: Optional[Dict[str, Any]] = None, 
@@ -329,11 +714,12 @@ class RobotFaceDisplay(Vision, Reconfigurable):
     
     async def close(self):
         """Clean up resources"""
-        if self.display:
-            try:
-                # Clear display on shutdown
-                image = Image.new("RGB", (self.width, self.height), (0, 0, 0))
-                self.display.image(image)
-                LOGGER.info("Display cleared on shutdown")
-            except Exception as e:
-                LOGGER.error(f"Error clearing display: {e}")
+        with self._config_lock:
+            self._stop_spi_worker()
+            if self.display:
+                try:
+                    # Clear display on shutdown
+                    self._push_frame(self._black_frame)
+                    LOGGER.info("Display cleared on shutdown")
+                except Exception as e:
+                    LOGGER.error(f"Error clearing display: {e}")
@@ -0,0 +1,50 @@
+import os
+import sys
+
+# Make the repository root importable so plain `pytest` finds src.robot_face,
+# the same package `python -m src` runs
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+from google.protobuf.struct_pb2 import Struct
+from viam.proto.app.robot import ComponentConfig
+
+from src.robot_face import RobotFaceDisplay
+
+
+class FakePanel:
+    """Stands in for the ST7789 driver, copying every _block write into a shadow framebuffer"""
+    
+    def __init__(self, shape):
+        self.shadow = np.zeros(shape, dtype=">u2")
+        self.blocks = []
+    
+    def _block(self, x0, y0, x1, y1, data):
+        self.blocks.append((x0, y0, x1, y1))
+        self.shadow[y0:y1 + 1, x0:x1 + 1] = np.frombuffer(data, dtype=">u2").reshape(y1 - y0 + 1, x1 - x0 + 1)
+
+
+class _TestFace(RobotFaceDisplay):
+    pass
+
+
+# Newer viam-sdk releases add abstract Vision methods this service doesn't use
+_TestFace.__abstractmethods__ = frozenset()
+
+
+@pytest.fixture
+def make_face():
+    """Build RobotFaceDisplay instances from config attributes, without display hardware"""
+    faces = []
+    
+    def make(**attributes):
+        struct = Struct()
+        struct.update(attributes)
+        face = _TestFace.new(ComponentConfig(name="face", attributes=struct), {})
+        faces.append(face)
+        return face
+    
+    yield make
+    for face in faces:
+        face._stop_spi_worker()
@@ -0,0 +1,35 @@
+"""
+Checks that partial updates leave the panel showing exactly the new frame
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from conftest import FakePanel
+from src.robot_face import _VALID_EXPRESSIONS
+
+
+@pytest.mark.parametrize("attributes", [{}, {"width": 128, "height": 160}, {"rotation": 0}])
+def test_every_transition_leaves_panel_in_sync(make_face, attributes):
+    face = make_face(**attributes)
+    frames = [face._face_cache[expression] for expression in sorted(_VALID_EXPRESSIONS)]
+    frames.append(face._black_frame)
+    face.display = FakePanel(frames[0].shape)
+    
+    for previous, current in itertools.product(frames, repeat=2):
+        face._push_frame(previous)
+        face._push_frame(current)
+        np.testing.assert_array_equal(face.display.shadow, current)
+
+
+def test_identical_frame_sends_nothing(make_face):
+    face = make_face()
+    frame = face._face_cache["happy"]
+    face.display = FakePanel(frame.shape)
+    
+    face._push_frame(frame)
+    sent = len(face.display.blocks)
+    face._push_frame(frame.copy())
+    assert len(face.display.blocks) == sent
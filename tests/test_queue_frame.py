@@ -0,0 +1,44 @@
+"""
+Checks how frames queued while the SPI thread is busy are coalesced
+"""
+
+import threading
+
+import numpy as np
+
+from conftest import FakePanel
+
+
+class _HeldPanel(FakePanel):
+    """A FakePanel whose first write blocks until released, keeping the SPI thread busy"""
+    
+    def __init__(self, shape):
+        super().__init__(shape)
+        self.writing = threading.Event()
+        self.release = threading.Event()
+    
+    def _block(self, x0, y0, x1, y1, data):
+        self.writing.set()
+        assert self.release.wait(timeout=5)
+        super()._block(x0, y0, x1, y1, data)
+
+
+def test_latest_frame_wins_and_keeps_forced_full_push(make_face):
+    face = make_face()
+    first, forced, latest = (face._face_cache[e] for e in ("happy", "surprised", "sad"))
+    face.display = _HeldPanel(first.shape)
+    face._start_spi_worker()
+    
+    face._queue_frame(first)
+    assert face.display.writing.wait(timeout=5)
+    # Both queued while the SPI thread is still sending the first frame
+    face._queue_frame(forced, full=True)
+    face._queue_frame(latest)
+    face.display.release.set()
+    face._spi_q.join()
+    
+    height, width = latest.shape
+    # The forced frame was never sent, but its full repaint carried over
+    # to the frame that replaced it
+    assert face.display.blocks == [(0, 0, width - 1, height - 1)] * 2
+    np.testing.assert_array_equal(face.display.shadow, latest)
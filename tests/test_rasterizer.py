@@ -0,0 +1,111 @@
+"""
+Checks the NumPy face rasterizer against the original ImageDraw rendering of
+every face, at a few display sizes
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from src.robot_face import RobotFaceDisplay, _VALID_EXPRESSIONS, _pack_rgb565
+
+SIZES = [(240, 240), (128, 160), (320, 240)]
+
+
+def _imagedraw_face(expression, width, height):
+    """The face as the original ImageDraw implementation drew it"""
+    image = Image.new("RGB", (width, height), (0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    center_x = width // 2
+    eye_y = height // 3
+    eye_spacing = width // 4
+    eye_radius = width // 12
+    mouth_y = int(height * 0.7)
+    mouth_width = width // 3
+    line_width = 6
+    if expression == "happy":
+        draw.ellipse((center_x - eye_spacing - eye_radius, eye_y - eye_radius, center_x - eye_spacing + eye_radius, eye_y + eye_radius), fill=(0, 255, 255))
+        draw.ellipse((center_x + eye_spacing - eye_radius, eye_y - eye_radius, center_x + eye_spacing + eye_radius, eye_y + eye_radius), fill=(0, 255, 255))
+        draw.arc((center_x - mouth_width//2, mouth_y - 20, center_x + mouth_width//2, mouth_y + 20), start=0, end=180, fill=(255, 255, 0), width=line_width)
+    elif expression == "sad":
+        draw.arc((center_x - eye_spacing - eye_radius, eye_y, center_x - eye_spacing + eye_radius, eye_y + eye_radius*1.5), start=180, end=360, fill=(100, 100, 255), width=line_width)
+        draw.arc((center_x + eye_spacing - eye_radius, eye_y, center_x + eye_spacing + eye_radius, eye_y + eye_radius*1.5), start=180, end=360, fill=(100, 100, 255), width=line_width)
+        draw.arc((center_x - mouth_width//2, mouth_y, center_x + mouth_width//2, mouth_y + 40), start=180, end=360, fill=(255, 100, 100), width=line_width)
+    elif expression == "surprised":
+        draw.ellipse((center_x - eye_spacing - eye_radius, eye_y - eye_radius, center_x - eye_spacing + eye_radius, eye_y + eye_radius), fill=(255, 255, 255))
+        draw.ellipse((center_x + eye_spacing - eye_radius, eye_y - eye_radius, center_x + eye_spacing + eye_radius, eye_y + eye_radius), fill=(255, 255, 255))
+        pupil_radius = eye_radius // 3
+        draw.ellipse((center_x - eye_spacing - pupil_radius, eye_y - pupil_radius, center_x - eye_spacing + pupil_radius, eye_y + pupil_radius), fill=(0, 0, 0))
+        draw.ellipse((center_x + eye_spacing - pupil_radius, eye_y - pupil_radius, center_x + eye_spacing + pupil_radius, eye_y + pupil_radius), fill=(0, 0, 0))
+        draw.ellipse((center_x - 20, mouth_y, center_x + 20, mouth_y + 35), fill=(255, 255, 255))
+    elif expression == "sleepy":
+        draw.line((center_x - eye_spacing - eye_radius, eye_y, center_x - eye_spacing + eye_radius, eye_y), fill=(200, 200, 200), width=line_width)
+        draw.line((center_x + eye_spacing - eye_radius, eye_y, center_x + eye_spacing + eye_radius, eye_y), fill=(200, 200, 200), width=line_width)
+        draw.text((center_x + 60, eye_y - 50), "Z", fill=(150, 150, 150))
+        draw.text((center_x + 75, eye_y - 70), "Z", fill=(100, 100, 100))
+        draw.arc((center_x - 30, mouth_y, center_x + 30, mouth_y + 20), start=0, end=180, fill=(200, 200, 200), width=line_width-2)
+    elif expression == "angry":
+        draw.line((center_x - eye_spacing - eye_radius, eye_y - 10, center_x - eye_spacing + eye_radius, eye_y + 10), fill=(255, 0, 0), width=line_width)
+        draw.line((center_x + eye_spacing - eye_radius, eye_y + 10, center_x + eye_spacing + eye_radius, eye_y - 10), fill=(255, 0, 0), width=line_width)
+        draw.line((center_x - mouth_width//2, mouth_y + 15, center_x + mouth_width//2, mouth_y), fill=(255, 0, 0), width=line_width)
+    elif expression == "confused":
+        draw.ellipse((center_x - eye_spacing - eye_radius, eye_y - eye_radius, center_x - eye_spacing + eye_radius, eye_y + eye_radius), fill=(255, 255, 255))
+        draw.ellipse((center_x + eye_spacing - eye_radius, eye_y - eye_radius + 10, center_x + eye_spacing + eye_radius, eye_y + eye_radius + 10), fill=(255, 255, 255))
+        pupil_radius = eye_radius // 3
+        draw.ellipse((center_x - eye_spacing - pupil_radius, eye_y - pupil_radius, center_x - eye_spacing + pupil_radius, eye_y + pupil_radius), fill=(0, 0, 0))
+        draw.ellipse((center_x + eye_spacing - pupil_radius, eye_y - pupil_radius + 10, center_x + eye_spacing + pupil_radius, eye_y + pupil_radius + 10), fill=(0, 0, 0))
+        mouth_x = center_x - mouth_width//2
+        draw.line((mouth_x, mouth_y + 5, mouth_x + 20, mouth_y - 5), fill=(200, 200, 0), width=line_width)
+        draw.line((mouth_x + 20, mouth_y - 5, mouth_x + 40, mouth_y + 5), fill=(200, 200, 0), width=line_width)
+        draw.line((mouth_x + 40, mouth_y + 5, mouth_x + 60, mouth_y - 5), fill=(200, 200, 0), width=line_width)
+    elif expression == "thinking":
+        for i in range(int(eye_radius / 2)):
+            angle1 = i * 72
+            angle2 = (i + 1) * 72
+            r = i * 2
+            draw.arc((center_x - eye_spacing - r, eye_y - r, center_x - eye_spacing + r, eye_y + r), start=angle1, end=angle2, fill=(100, 100, 255), width=3)
+            draw.arc((center_x + eye_spacing - r, eye_y - r, center_x + eye_spacing + r, eye_y + r), start=angle1, end=angle2, fill=(100, 100, 255), width=3)
+        draw.line((center_x - 25, mouth_y, center_x + 25, mouth_y), fill=(200, 200, 200), width=line_width)
+        draw.line((center_x + 25, mouth_y, center_x + 35, mouth_y - 10), fill=(200, 200, 200), width=line_width)
+    else:
+        draw.ellipse((center_x - eye_spacing - eye_radius, eye_y - eye_radius, center_x - eye_spacing + eye_radius, eye_y + eye_radius), fill=(255, 255, 255))
+        draw.ellipse((center_x + eye_spacing - eye_radius, eye_y - eye_radius, center_x + eye_spacing + eye_radius, eye_y + eye_radius), fill=(255, 255, 255))
+        pupil_radius = eye_radius // 2
+        draw.ellipse((center_x - eye_spacing - pupil_radius, eye_y - pupil_radius, center_x - eye_spacing + pupil_radius, eye_y + pupil_radius), fill=(0, 0, 0))
+        draw.ellipse((center_x + eye_spacing - pupil_radius, eye_y - pupil_radius, center_x + eye_spacing + pupil_radius, eye_y + pupil_radius), fill=(0, 0, 0))
+        draw.line((center_x - mouth_width//2, mouth_y, center_x + mouth_width//2, mouth_y), fill=(200, 200, 200), width=line_width)
+    return image
+
+
+def _render(expression, width, height):
+    """The face as RobotFaceDisplay renders it for a display of the given size"""
+    face = SimpleNamespace(width=width, height=height)
+    face._face_ops = RobotFaceDisplay._build_face_ops(face)
+    return RobotFaceDisplay._render_face(face, expression)
+
+
+def _edges(frame):
+    """Pixels whose 3x3 neighbourhood isn't all the same color"""
+    height, width = frame.shape
+    padded = np.pad(frame, 1, mode="edge")
+    edges = np.zeros(frame.shape, dtype=bool)
+    for dy in (0, 1, 2):
+        for dx in (0, 1, 2):
+            edges |= padded[dy:dy + height, dx:dx + width] != frame
+    return edges
+
+
+@pytest.mark.parametrize("width, height", SIZES)
+@pytest.mark.parametrize("expression", sorted(_VALID_EXPRESSIONS))
+def test_face_matches_imagedraw(expression, width, height):
+    expected = _pack_rgb565(_imagedraw_face(expression, width, height))
+    actual = _render(expression, width, height)
+    differs = actual != expected
+
+    # The shapes are rasterized independently of PIL, so their outlines may
+    # land a pixel differently, but every difference has to sit on an edge
+    # of the original drawing, and they must stay a minority of its pixels
+    assert not (differs & ~_edges(expected)).any()
+    assert differs.sum() <= 0.3 * np.count_nonzero(expected)